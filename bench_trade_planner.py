@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark for trade_planner.py
+Plays randomised rounds and compares how many transactions the fixed ring
+rotation sends with how many the planner needs, and how long planning takes.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from trade_planner import plan_round, plan_settlement, ring_trades
+
+RESOURCES = ["FIRE", "ELECTRICITY", "WATER", "LAND"]
+
+def bench_ring_rounds(players, rounds, rng):
+    """Game-style rounds: every player offers one card, wants follow the rotation."""
+    ring_txs, planned_txs, times = 0, 0, []
+    for _ in range(rounds):
+        offers = {f"Player{i}": rng.choice(RESOURCES) for i in range(1, players + 1)}
+        t0 = time.perf_counter()
+        transfers = plan_round(offers)
+        times.append(time.perf_counter() - t0)
+        ring_txs += len(ring_trades(offers))
+        planned_txs += len(transfers)
+    return ring_txs, planned_txs, times
+
+def bench_open_rounds(players, rounds, rng, max_cards=3):
+    """Free-form rounds: random multi-card offers and wants, balanced per resource."""
+    naive_txs, planned_txs, times = 0, 0, []
+    names = [f"Player{i}" for i in range(1, players + 1)]
+    for _ in range(rounds):
+        offered = {p: {} for p in names}
+        wanted = {p: {} for p in names}
+        for _ in range(players):
+            resource = rng.choice(RESOURCES)
+            n = rng.randint(1, max_cards)
+            giver, taker = rng.sample(names, 2)
+            offered[giver][resource] = offered[giver].get(resource, 0) + n
+            wanted[taker][resource] = wanted[taker].get(resource, 0) + n
+            naive_txs += 1  # one tx per card movement without planning
+        t0 = time.perf_counter()
+        transfers = plan_settlement(offered, wanted)
+        times.append(time.perf_counter() - t0)
+        planned_txs += len(transfers)
+    return naive_txs, planned_txs, times
+
+def report(label, players, before, after, times):
+    saved = 1 - after / before if before else 0
+    print(f"  {label:5} {players:5} players: {before:7} → {after:7} txs ({saved:5.1%} fewer), "
+          f"plan p50 {statistics.median(times) * 1e6:8.1f} µs, max {max(times) * 1e6:8.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the round trade planner")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--players", type=int, nargs="*", default=[2, 4, 16, 64, 256])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"📊 Trade planner benchmark ({args.rounds} rounds per size, seed {args.seed})")
+    for players in args.players:
+        report("ring", players, *bench_ring_rounds(players, args.rounds, rng))
+    for players in args.players:
+        report("open", players, *bench_open_rounds(players, args.rounds, rng))
+
+if __name__ == "__main__":
+    main()
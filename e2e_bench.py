@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Hardware-free end-to-end benchmark for WTB project
+Runs the real game_mode.py against two pty-backed virtual NFC readers that
+speak the nfc_lcd_input protocol (SCAN out, DISPLAY/LINE/HOST in) and a local
+dev chain, plays full 4-player rounds and writes a latency report:
+tap-to-LCD, tap-to-tx-hash and rounds per minute.
+
+Needs `anvil` (Foundry) on PATH, or --rpc-url for an already running dev node
+funded from the standard test mnemonic (anvil, hardhat).
+
+Usage:
+    python e2e_bench.py --rounds 5
+    python e2e_bench.py --rpc-url http://127.0.0.1:8545 --baseline last_report.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import pty
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tty
+import urllib.request
+
+GAME_SCRIPT = "game_mode.py"
+REPORT_PATH = "e2e_report.json"
+
+LCD_TIMEOUT_S = 5
+ROUND_TIMEOUT_S = 60
+
+# Well-known dev keys for the "test test ... junk" mnemonic (anvil/hardhat accounts 0-3)
+DEV_KEYS = [
+    "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+    "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d",
+    "0x5de4111afa1a4b94908f83103eb1f1706367c2e68ca870fc3fb9a804cdab365a",
+    "0x7c852118294e51e653712a81e05800f419141751be58f605c371e15141b007a6",
+]
+
+# Which reader each player taps on, and the card they trade each round. The
+# last player confirms, so the next round opens on each reader with a tag other
+# than the one the firmware read last.
+ROUND_SCRIPT = [
+    (1, "Player1", "FIRE"),
+    (1, "Player2", "ELECTRICITY"),
+    (2, "Player3", "WATER"),
+    (2, "Player4", "LAND"),
+]
+
+
+def load_game_constants(path=GAME_SCRIPT):
+    """
+    Read PLAYER_TAGS, RESOURCE_CARDS and DEBOUNCE_WINDOW_S from game_mode.py
+    without running it. Returns (player -> uid, resource -> uids, window).
+    """
+    wanted = ("PLAYER_TAGS", "RESOURCE_CARDS", "DEBOUNCE_WINDOW_S")
+    consts = {}
+    with open(path) as f:
+        for node in ast.parse(f.read()).body:
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+                name = node.targets[0].id
+                if name in wanted:
+                    consts[name] = ast.literal_eval(node.value)
+    player_uid = {player: uid for uid, player in consts["PLAYER_TAGS"].items()}
+    cards = {r: list(dict.fromkeys(uids)) for r, uids in consts["RESOURCE_CARDS"].items()}
+    return player_uid, cards, consts["DEBOUNCE_WINDOW_S"]
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def summarize(seconds):
+    if not seconds:
+        return None
+    ms = [s * 1000 for s in seconds]
+    return {"n": len(ms), "p50_ms": round(statistics.median(ms), 2),
+            "p95_ms": round(percentile(ms, 95), 2), "max_ms": round(max(ms), 2)}
+
+
+class VirtualReader:
+    """A pty that behaves like an nfc_lcd_input board on the other end of a serial port."""
+
+    def __init__(self, number):
+        self.number = number
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)  # no echo / line translation, like a USB CDC port
+        self.port = os.ttyname(self.slave)
+        self.lcd = ["", ""]
+        self.host_controls_lcd = False
+        self.last_uid = None  # the firmware only sends a UID that differs from the last one
+        self.displays = []   # (time, text) for every LCD update from the host
+        self.cond = threading.Condition()
+        threading.Thread(target=self._read_host, daemon=True).start()
+        os.write(self.master, b"Hello Farcaster\r\n")
+
+    def _read_host(self):
+        buf = b""
+        while True:
+            try:
+                chunk = os.read(self.master, 1024)
+            except OSError:
+                return
+            buf += chunk
+            while b"\n" in buf:
+                raw, buf = buf.split(b"\n", 1)
+                self._handle(raw.decode(errors="replace").strip())
+
+    def _handle(self, line):
+        now = time.perf_counter()
+        if line.startswith("DISPLAY:"):
+            msg = line[8:]
+            self.lcd = [msg[:16], msg[16:32]]
+        elif line.startswith("LINE1:"):
+            self.lcd[0] = line[6:22]
+        elif line.startswith("LINE2:"):
+            self.lcd[1] = line[6:22]
+        elif line.startswith("HOST:"):
+            self.host_controls_lcd = line[5:] == "1"
+            return
+        else:
+            return
+        with self.cond:
+            self.displays.append((now, " / ".join(self.lcd).strip(" /")))
+            self.cond.notify_all()
+
+    def tap(self, uid):
+        """
+        Send a SCAN line and return the time it was written. Like the firmware's
+        `if (uid != lastUID)`, a repeat of the previous card sends nothing (None).
+        """
+        if uid == self.last_uid:
+            return None
+        self.last_uid = uid
+        t = time.perf_counter()
+        os.write(self.master, f"SCAN,{uid}\r\n".encode())
+        return t
+
+    def display_count(self):
+        with self.cond:
+            return len(self.displays)
+
+    def wait_for_update(self, seen):
+        """Block until LCD update number `seen` arrives; returns (time, text)."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: len(self.displays) > seen, LCD_TIMEOUT_S):
+                raise RuntimeError(f"Reader {self.number}: no LCD update from the host")
+            return self.displays[seen]
+
+    def wait_for_text(self, text, after):
+        """Block until the host shows `text` on this LCD at or after `after`."""
+        with self.cond:
+            if not self.cond.wait_for(lambda: any(t >= after and d == text for t, d in self.displays), LCD_TIMEOUT_S):
+                raise RuntimeError(f"Reader {self.number}: LCD never showed {text!r}")
+
+
+class GameProcess:
+    """game_mode.py under test, with its stdout captured line by line."""
+
+    def __init__(self, env):
+        self.lines = []   # (time, line)
+        self.cond = threading.Condition()
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", GAME_SCRIPT], env=env, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8",
+        )
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            with self.cond:
+                self.lines.append((time.perf_counter(), line.rstrip()))
+                self.cond.notify_all()
+
+    def wait_for(self, prefix, after=0.0, timeout=ROUND_TIMEOUT_S):
+        """Return (time, line) of the first line starting with `prefix` logged after `after`."""
+        def find():
+            return next(((t, l) for t, l in self.lines if t >= after and l.startswith(prefix)), None)
+        with self.cond:
+            found = self.cond.wait_for(lambda: find() or self.proc.poll() is not None, timeout)
+            hit = find()
+        if not hit:
+            tail = "\n".join(l for _, l in self.lines[-15:])
+            raise RuntimeError(f"game_mode.py never printed {prefix!r}{'' if found else ' (timeout)'}:\n{tail}")
+        return hit
+
+    def lines_between(self, prefix, start, end):
+        with self.cond:
+            return [(t, l) for t, l in self.lines if start <= t <= end and l.startswith(prefix)]
+
+    def stop(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def rpc_call(url, method, params=()):
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)}).encode()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return json.load(resp).get("result")
+
+def start_anvil():
+    if not shutil.which("anvil"):
+        sys.exit("❌ anvil not found on PATH. Install Foundry or pass --rpc-url for a running dev node.")
+    port = free_port()
+    proc = subprocess.Popen(["anvil", "--port", str(port), "--silent"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            if rpc_call(url, "eth_chainId"):
+                return proc, url
+        except OSError:  # URLError / connection refused while anvil boots
+            time.sleep(0.1)
+    proc.kill()
+    sys.exit("❌ anvil did not start")
+
+
+def play_round(readers, game, player_uid, cards, debounce_s, round_no, last_tap):
+    """Drive one 4-player round; returns (lcd latencies, tx latencies, round seconds, tx hashes)."""
+    lcd_latencies = []
+
+    def pace(reader, uid):
+        # Respect the host debounce window, as a real player would have to: a
+        # repeat UID needs the window to pass since the card read in between
+        if (reader, uid) not in last_tap:
+            return
+        between = max((t for (r, u), t in last_tap.items() if r == reader and u != uid), default=None)
+        if between is not None:
+            wait = between + debounce_s + 0.05 - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+    def send(reader, uid):
+        t0 = readers[reader].tap(uid)
+        if t0 is None:
+            raise RuntimeError(f"Reader {reader}: {uid} was the last card read; the firmware would drop this tap")
+        return t0
+
+    def tap(reader, uid):
+        pace(reader, uid)
+        # The host shows each message on both LCDs; wait for all of them so a
+        # late copy isn't credited to the next tap
+        seen = {n: r.display_count() for n, r in readers.items()}
+        t0 = send(reader, uid)
+        shown = {n: r.wait_for_update(seen[n]) for n, r in readers.items()}
+        last_tap[(reader, uid)] = t0
+        lcd_latencies.append(shown[reader][0] - t0)
+
+    round_start = time.perf_counter()
+    for reader, player, resource in ROUND_SCRIPT:
+        tap(reader, player_uid[player])
+        tap(reader, cards[resource][round_no])
+
+    # The last player taps again to confirm; the round ends when the game resets
+    reader, player, _ = ROUND_SCRIPT[-1]
+    pace(reader, player_uid[player])
+    confirm_at = send(reader, player_uid[player])
+    last_tap[(reader, player_uid[player])] = confirm_at
+    reset_at, _ = game.wait_for("🔁 State reset.", after=confirm_at)
+    # Let the reset screen land so it isn't mistaken for the next tap's response
+    for r in readers.values():
+        r.wait_for_text("Ready to scan", after=confirm_at)
+
+    txs = game.lines_between("📡 TX", confirm_at, reset_at)
+    if game.lines_between("⚠️ Transaction failed", confirm_at, reset_at):
+        raise RuntimeError(f"Round {round_no + 1}: transaction failed, see game output")
+    tx_latencies = [t - confirm_at for t, _ in txs]
+    hashes = [l.rsplit(" ", 1)[-1] for _, l in txs]
+    return lcd_latencies, tx_latencies, reset_at - round_start, hashes
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """Return a list of metrics that got worse than `tolerance` (fraction) vs the baseline."""
+    regressions = []
+    for key in ("tap_to_lcd", "tap_to_first_tx", "tap_to_last_tx"):
+        old, new = (baseline.get(key) or {}).get("p50_ms"), (report.get(key) or {}).get("p50_ms")
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"{key} p50 {old} → {new} ms")
+    old, new = baseline.get("rounds_per_minute"), report.get("rounds_per_minute")
+    if old and new and new < old * (1 - tolerance):
+        regressions.append(f"rounds_per_minute {old} → {new}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end WTB benchmark on virtual readers and a dev chain")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--rpc-url", help="use a running dev node instead of starting anvil")
+    parser.add_argument("--report", default=REPORT_PATH, help="where to write the JSON report")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))  # game_mode.py loads sounds/ relative paths
+    player_uid, cards, debounce_s = load_game_constants()
+    max_rounds = min(len(cards[r]) for _, _, r in ROUND_SCRIPT)
+    if args.rounds > max_rounds:
+        print(f"⚠️ Only {max_rounds} unused cards per resource; running {max_rounds} rounds")
+        args.rounds = max_rounds
+
+    anvil = None
+    rpc_url = args.rpc_url
+    if not rpc_url:
+        anvil, rpc_url = start_anvil()
+
+    readers = {1: VirtualReader(1), 2: VirtualReader(2)}
+    config_path = os.path.abspath(f".e2e_readers_{os.getpid()}.json")
+    with open(config_path, "w") as f:
+        json.dump({"readers": [{"reader": n, "port": r.port, "baud": 115200} for n, r in readers.items()]}, f)
+
+    env = dict(os.environ, INFURA_URL=rpc_url, WTB_READER_CONFIG=config_path,
+               WTB_STATUS_PORT=str(free_port()), SDL_AUDIODRIVER="dummy",
+               **{f"PRIVATE_KEY_{i + 1}": key for i, key in enumerate(DEV_KEYS)})
+
+    print(f"🧪 {args.rounds} round(s) on {readers[1].port}, {readers[2].port} → {rpc_url}")
+    game = GameProcess(env)
+    try:
+        game.wait_for("🔌 Ready for 4-player mode", timeout=30)
+        lcd, first_tx, last_tx, round_times, hashes = [], [], [], [], []
+        last_tap = {}
+        started = time.perf_counter()
+        for n in range(args.rounds):
+            lcd_lat, tx_lat, round_s, tx_hashes = play_round(readers, game, player_uid, cards, debounce_s, n, last_tap)
+            lcd += lcd_lat
+            round_times.append(round_s)
+            hashes += tx_hashes
+            if tx_lat:
+                first_tx.append(min(tx_lat))
+                last_tx.append(max(tx_lat))
+            print(f"  Round {n + 1}: {round_s:.2f}s, {len(tx_hashes)} tx(s), "
+                  f"LCD p50 {statistics.median(lcd_lat) * 1000:.1f} ms")
+        elapsed = time.perf_counter() - started
+    finally:
+        game.stop()
+        os.remove(config_path)
+
+    mined = sum(1 for h in hashes if rpc_call(rpc_url, "eth_getTransactionReceipt", [h]))
+    if anvil:
+        anvil.terminate()
+
+    report = {
+        "rounds": args.rounds,
+        "transactions": len(hashes),
+        "transactions_mined": mined,
+        "tap_to_lcd": summarize(lcd),
+        "tap_to_first_tx": summarize(first_tx),
+        "tap_to_last_tx": summarize(last_tx),
+        "round_seconds": summarize(round_times),
+        "rounds_per_minute": round(args.rounds / elapsed * 60, 2),
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+    print("\n📊 Report")
+    for key, value in report.items():
+        print(f"  {key:20} {value}")
+    print(f"💾 Wrote {args.report}")
+
+    if mined != len(hashes):
+        sys.exit(f"❌ Only {mined}/{len(hashes)} transactions were mined")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        if regressions:
+            print("❌ Regressions vs baseline:")
+            for r in regressions:
+                print(f"   {r}")
+            sys.exit(1)
+        print("✅ No regressions vs baseline")
+
+if __name__ == "__main__":
+    main()
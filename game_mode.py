@@ -3,27 +3,54 @@
 
 import serial
 import threading
+import json
+import os
 from datetime import datetime
 import pygame
 import uuid
 import sys
 import select
 import time
+from collections import deque
 from onchain import trigger_transaction  # must be defined
+from status_server import StatusFeed, start_status_server
+from trade_planner import plan_round
 
 # Serial ports from Arduino - Two NFC readers
 PORT1 = "/dev/tty.usbmodem101"   # Reader 1 (Player1 & Player2)
 PORT2 = "/dev/tty.usbmodem1101"  # Reader 2 (Player3 & Player4)
 BAUD = 115200
 
+# Reader config written by test_ports.py; overrides the defaults above if present
+READER_CONFIG = os.getenv("WTB_READER_CONFIG", "readers.json")
+
+def load_reader_config(path=READER_CONFIG):
+    readers = {1: (PORT1, BAUD), 2: (PORT2, BAUD)}
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return readers
+    configured = config.get("readers", [])
+    for r in configured:
+        readers[int(r["reader"])] = (r["port"], int(r.get("baud") or BAUD))
+    missing = sorted({1, 2} - {int(r["reader"]) for r in configured})
+    for n in missing:
+        print(f"⚠️ {path} has no reader {n}; using default {readers[n][0]}")
+    return readers
+
+READERS = load_reader_config()
+PORT1, BAUD1 = READERS[1]
+PORT2, BAUD2 = READERS[2]
+
 # Initialize both serial connections
-ser1 = serial.Serial(PORT1, BAUD, timeout=0)  # non-blocking
+ser1 = serial.Serial(PORT1, BAUD1, timeout=0)  # non-blocking
 try:
     ser1.setDTR(False); ser1.setRTS(False)     # avoid auto-reset loops
 except Exception:
     pass
 
-ser2 = serial.Serial(PORT2, BAUD, timeout=0)  # non-blocking
+ser2 = serial.Serial(PORT2, BAUD2, timeout=0)  # non-blocking
 try:
     ser2.setDTR(False); ser2.setRTS(False)     # avoid auto-reset loops
 except Exception:
@@ -33,6 +60,16 @@ time.sleep(0.3)
 ser1.reset_input_buffer()
 ser2.reset_input_buffer()
 
+def claim_lcd(ser):
+    """Tell the firmware the host drives the LCD, so it skips its own "Tag:" echo."""
+    try:
+        ser.write(b"HOST:1\n")
+    except Exception:
+        pass
+
+claim_lcd(ser1)
+claim_lcd(ser2)
+
 
 # Map scanned UIDs to known players
 PLAYER_TAGS = {
@@ -138,6 +175,83 @@ pending = {
 used_block_uids = set()
 active_player = None
 
+# Host-side scan debouncing. The firmware never resends its lastUID until a
+# different card is read, so a repeat that reaches the host always has another
+# card in between (X, Y, X). The window is measured from that in-between card:
+# X is dropped only if Y was read less than DEBOUNCE_WINDOW_S earlier, i.e. two
+# cards fluttering over the reader. A deliberate player → resource → player
+# confirm is slower than that. If a confirm is dropped anyway it can't be redone
+# (tapping X again sends nothing until the firmware reads another card), so it
+# is retried once the window has passed, unless another card arrives first.
+DEBOUNCE_WINDOW_S = 0.75  # min gap after a different card before a repeat counts
+DEBOUNCE_HISTORY = 4      # recent UIDs remembered per reader
+VALID_UID_LENGTHS = (8, 14, 20)   # 4, 7 or 10 byte MIFARE UIDs as hex
+
+class ScanDebouncer:
+    """Per-reader duplicate-tap filter backed by a small ring buffer of recent UIDs."""
+
+    def __init__(self, window_s=DEBOUNCE_WINDOW_S, history=DEBOUNCE_HISTORY):
+        self.window_s = window_s
+        self.recent = deque(maxlen=history)  # (uid, monotonic time accepted)
+        self.stats = {"accepted": 0, "dropped_duplicate": 0, "dropped_malformed": 0}
+
+    def accept(self, uid, now=None):
+        """Return True if `uid` should reach process_scan, False if it is noise."""
+        now = time.monotonic() if now is None else now
+        if len(uid) not in VALID_UID_LENGTHS or any(c not in "0123456789ABCDEF" for c in uid):
+            self.stats["dropped_malformed"] += 1
+            return False
+        if any(seen_uid == uid for seen_uid, _ in self.recent):
+            # When was the card in between read? (newest accepted UID that isn't this one)
+            other_at = next((t for u, t in reversed(self.recent) if u != uid), None)
+            if other_at is not None and now - other_at < self.window_s:
+                self.stats["dropped_duplicate"] += 1
+                return False
+        self.recent.append((uid, now))
+        self.stats["accepted"] += 1
+        return True
+
+debouncers = {1: ScanDebouncer(), 2: ScanDebouncer()}
+
+# Confirms dropped by the debouncer, waiting to be retried (threading.Timer per reader)
+deferred_confirms = {1: None, 2: None}
+
+def handle_scan(reader, uid):
+    """Debounce a SCAN from `reader` and pass it on to process_scan."""
+    retry = deferred_confirms[reader]
+    if retry is not None:
+        retry.cancel()  # another card arrived, so the dropped tap was flutter
+        deferred_confirms[reader] = None
+    if debouncers[reader].accept(uid):
+        process_scan(uid)
+        publish_status()
+    elif uid in PLAYER_TAGS and pending[PLAYER_TAGS[uid]]["resource"] is not None:
+        retry = threading.Timer(DEBOUNCE_WINDOW_S, handle_scan, (reader, uid))
+        retry.daemon = True
+        deferred_confirms[reader] = retry
+        retry.start()
+
+def debounce_stats():
+    """Drop counters per reader, for tuning DEBOUNCE_WINDOW_S."""
+    return {reader: dict(d.stats) for reader, d in debouncers.items()}
+
+# Live status feed for spectator screens (see status_server.py)
+STATUS_PORT = int(os.getenv("WTB_STATUS_PORT", "8080"))
+status_feed = StatusFeed()
+# Transactions of the current/last round, for the status feed
+tx_status = []
+
+def publish_status():
+    """Publish a fresh copy of the game state; the status server never reads live state."""
+    status_feed.publish({
+        "active_player": active_player,
+        "pending": {p: dict(choice) for p, choice in pending.items()},
+        "burned_uids": len(used_block_uids),
+        "transactions": [dict(tx) for tx in tx_status],
+        "scan_stats": debounce_stats(),
+        "updated_at": time.time(),
+    })
+
 # Sounds
 pygame.mixer.init()
 sounds = {
@@ -171,6 +285,7 @@ def reset_state():
         "Player4": {"resource": None, "uid": None}
     }
     print("🔁 State reset.")
+    publish_status()
     send_lcd("Ready to scan")
     try:
         sounds["reset"].play()
@@ -178,6 +293,7 @@ def reset_state():
         pass
 
 def check_and_commit_trade(force=False):
+    global tx_status
     # Collect all players with resources
     players_with_resources = []
     for player in ["Player1", "Player2", "Player3", "Player4"]:
@@ -196,27 +312,40 @@ def check_and_commit_trade(force=False):
         print(f"  {player} trading: {res}")
     
     send_lcd("Sending tx…")
-    
+    tx_status = []
+
     try:
-        # Each player with a resource sends to the next player in rotation
-        # This creates a circular trade: P1→P2→P3→P4→P1
-        for i, sender in enumerate(players_with_resources):
-            recipient = players_with_resources[(i + 1) % len(players_with_resources)]
-            resource = pending[sender]["resource"]
-            
-            if resource:
-                tx_hash = trigger_transaction(sender, recipient, resource)
-                print(f"📡 TX ({sender}→{recipient}): {tx_hash}")
-                # Display player numbers (e.g., "P1>P2 OK")
-                sender_num = sender[-1]  # Last char of "Player1" = "1"
-                recipient_num = recipient[-1]  # Last char of "Player2" = "2"
-                send_lcd(f"P{sender_num}>P{recipient_num} OK")
-                
-                # Burn the sender's block UID
-                if pending[sender]["uid"]:
-                    used_block_uids.add(pending[sender]["uid"])
-                
-                time.sleep(0.5)  # Brief delay between transactions
+        # The rotation (P1→P2→P3→P4→P1: each player receives the previous
+        # player's resource) is only the planner's input. It nets out transfers
+        # that cancel, e.g. two players swapping the same resource, and only
+        # the remaining transfers are sent
+        offers = {p: pending[p]["resource"] for p in players_with_resources}
+        transfers = plan_round(offers)
+        if not transfers:
+            print("♻️ Trades net out, no transactions needed.")
+            send_lcd("Trades netted")
+
+        for sender, recipient, resource, units in transfers:
+            tx = {"sender": sender, "recipient": recipient, "resource": resource,
+                  "units": units, "status": "sending", "tx_hash": None}
+            tx_status.append(tx)
+            publish_status()
+
+            tx_hash = trigger_transaction(sender, recipient, resource, units)
+            print(f"📡 TX ({sender}→{recipient}): {tx_hash}")
+            tx["status"], tx["tx_hash"] = "sent", tx_hash
+            publish_status()
+            # Display player numbers (e.g., "P1>P2 OK")
+            sender_num = sender[-1]  # Last char of "Player1" = "1"
+            recipient_num = recipient[-1]  # Last char of "Player2" = "2"
+            send_lcd(f"P{sender_num}>P{recipient_num} OK")
+
+            time.sleep(0.5)  # Brief delay between transactions
+
+        # Burn every traded block, including ones whose transfer netted out
+        for player in players_with_resources:
+            if pending[player]["uid"]:
+                used_block_uids.add(pending[player]["uid"])
 
         try:
             sounds["confirm"].play()
@@ -225,6 +354,13 @@ def check_and_commit_trade(force=False):
 
     except Exception as e:
         print(f"⚠️ Transaction failed: {e}")
+        for tx in tx_status:
+            if tx["status"] == "sending":
+                tx["status"] = "failed"
+            elif tx["status"] == "sent" and pending[tx["sender"]]["uid"]:
+                # Already on chain, so the block can't be reused
+                used_block_uids.add(pending[tx["sender"]]["uid"])
+        publish_status()
         send_lcd("Tx failed")
 
     time.sleep(2)
@@ -292,8 +428,10 @@ def serial_loop_reader1():
         try:
             line = ser1.readline().decode().strip()
             if line.startswith("SCAN,"):
-                uid = line.split(",")[1]
-                process_scan(uid)
+                uid = line.split(",")[1].strip().upper()
+                handle_scan(1, uid)
+            elif line.startswith("Hello Farcaster"):
+                claim_lcd(ser1)  # reader rebooted and forgot HOST:1
         except Exception as e:
             print("Reader 1 error:", e)
 
@@ -303,8 +441,10 @@ def serial_loop_reader2():
         try:
             line = ser2.readline().decode().strip()
             if line.startswith("SCAN,"):
-                uid = line.split(",")[1]
-                process_scan(uid)
+                uid = line.split(",")[1].strip().upper()
+                handle_scan(2, uid)
+            elif line.startswith("Hello Farcaster"):
+                claim_lcd(ser2)  # reader rebooted and forgot HOST:1
         except Exception as e:
             print("Reader 2 error:", e)
 
@@ -318,6 +458,17 @@ def check_for_keypress():
             elif key == "P":
                 print("🛑 Manual reset.")
                 reset_state()
+            elif key == "S":
+                for reader, stats in debounce_stats().items():
+                    print(f"📊 Reader {reader}: {stats}")
+
+# Start the spectator feed; the game runs fine without it
+try:
+    status_port = start_status_server(status_feed, port=STATUS_PORT)
+    print(f"📺 Status feed on http://localhost:{status_port}/")
+except RuntimeError as e:
+    print(f"⚠️ {e}")
+publish_status()
 
 # Start threads for both readers
 threading.Thread(target=serial_loop_reader1, daemon=True).start()
@@ -327,6 +478,6 @@ threading.Thread(target=check_for_keypress, daemon=True).start()
 print("🔌 Ready for 4-player mode with 2 NFC readers!")
 print(f"   Reader 1 ({PORT1}): Player1 & Player2")
 print(f"   Reader 2 ({PORT2}): Player3 & Player4")
-print("   Press C to confirm trade, P to reset.")
+print("   Press C to confirm trade, P to reset, S for scan stats.")
 while True:
     time.sleep(1)
@@ -39,6 +39,20 @@ unsigned long lastScanMillis = 0;
 bool showingIdle = true;
 String lastUID = "";
 
+// --- LCD framebuffer: mirrors what is on screen so only changed
+// characters are sent over I2C (no lcd.clear() + full rewrite)
+#define LCD_COLS 16
+#define LCD_ROWS 2
+char lcdFrame[LCD_ROWS][LCD_COLS];
+
+// Set by the host with HOST:1 — it drives the screen, so skip the local "Tag:"
+// echo and the idle screen redraw
+bool hostControlsLcd = false;
+
+// Host command being received (read without blocking the NFC poll)
+String serialLine = "";
+const unsigned int MAX_SERIAL_LINE = 64;
+
 // --- Utilities ---
 String uidHex(const MFRC522::Uid &u){
   String s;
@@ -50,12 +64,39 @@ String uidHex(const MFRC522::Uid &u){
   return s;
 }
 
+// Call after a real lcd.clear() so the framebuffer matches the blank screen
+void lcdResetFrame() {
+  memset(lcdFrame, ' ', sizeof(lcdFrame));
+}
+
+// Write `text` (padded/truncated to 16) to `row`, touching only changed cells
+void lcdWriteLine(byte row, const String &text) {
+  byte col = 0;
+  while (col < LCD_COLS) {
+    char c = col < text.length() ? text[col] : ' ';
+    if (lcdFrame[row][col] == c) {
+      col++;
+      continue;
+    }
+    // Start of a changed run: one setCursor, then write until cells match again
+    lcd.setCursor(col, row);
+    while (col < LCD_COLS) {
+      c = col < text.length() ? text[col] : ' ';
+      if (lcdFrame[row][col] == c) break;
+      lcd.write(c);
+      lcdFrame[row][col] = c;
+      col++;
+    }
+  }
+}
+
+void lcdShow(const String &line1, const String &line2) {
+  lcdWriteLine(0, line1);
+  lcdWriteLine(1, line2);
+}
+
 void showIdleScreen() {
-  lcd.clear();
-  lcd.setCursor(0,0);
-  lcd.print("Hello Farcaster!");
-  lcd.setCursor(0,1);
-  lcd.print("Ready to Scan:");
+  lcdShow("Hello Farcaster!", "Ready to Scan:");
   showingIdle = true;
 }
 
@@ -76,8 +117,8 @@ void setup(){
 #endif
 
   lcd.clear();
-  lcd.setCursor(0,0);
-  lcd.print("LCD Ready");
+  lcdResetFrame();
+  lcdShow("LCD Ready", "");
   delay(800);
   showIdleScreen();
 
@@ -99,11 +140,9 @@ void loop(){
     if (uid != lastUID) {
       Serial.println("SCAN," + uid);
 
-      lcd.clear();
-      lcd.setCursor(0, 0);
-      lcd.print("Tag:");
-      lcd.setCursor(0, 1);
-      lcd.print(uid.substring(0, 16));
+      if (!hostControlsLcd) {
+        lcdShow("Tag:", uid.substring(0, 16));
+      }
 
       lastUID = uid;
     }
@@ -115,27 +154,43 @@ void loop(){
     delay(200);
   }
 
-  if (!showingIdle && (millis() - lastScanMillis >= IDLE_TIMEOUT_MS)) {
+  if (!hostControlsLcd && !showingIdle && (millis() - lastScanMillis >= IDLE_TIMEOUT_MS)) {
     showIdleScreen();
   }
 
   delay(5);
 }
 
+// Host commands (one per line):
+//   DISPLAY:<text>  replace both lines (chars 0-15 on line 1, 16-31 on line 2)
+//   LINE1:<text>    update line 1 only
+//   LINE2:<text>    update line 2 only
+//   HOST:1 / HOST:0 host does / doesn't own the screen (skips the "Tag:" echo and idle screen)
+void handleHostCommand(String input) {
+  input.trim();
+
+  if (input.startsWith("DISPLAY:")) {
+    String message = input.substring(8);
+    lcdShow(message.substring(0, 16), message.length() > 16 ? message.substring(16, 32) : "");
+  } else if (input.startsWith("LINE1:")) {
+    lcdWriteLine(0, input.substring(6));
+  } else if (input.startsWith("LINE2:")) {
+    lcdWriteLine(1, input.substring(6));
+  } else if (input.startsWith("HOST:")) {
+    hostControlsLcd = input.substring(5) == "1";
+  }
+}
+
+// Drain whatever has arrived without waiting for the rest of a line, so a
+// partial command never stalls the next PICC_IsNewCardPresent() poll
 void checkSerialInput() {
-  if (Serial.available()) {
-    String input = Serial.readStringUntil('\n');
-    input.trim();
-
-    if (input.startsWith("DISPLAY:")) {
-      String message = input.substring(8);
-      lcd.clear();
-      lcd.setCursor(0, 0);
-      lcd.print(message.substring(0, 16));
-      if (message.length() > 16) {
-        lcd.setCursor(0, 1);
-        lcd.print(message.substring(16, 32));
-      }
+  while (Serial.available()) {
+    char c = Serial.read();
+    if (c == '\n') {
+      handleHostCommand(serialLine);
+      serialLine = "";
+    } else if (serialLine.length() < MAX_SERIAL_LINE) {
+      serialLine += c;
     }
   }
 }
\ No newline at end of file
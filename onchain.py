@@ -2,6 +2,10 @@
 
 from web3 import Web3
 import os
+import json
+import threading
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -25,8 +29,100 @@ _require(INFURA_URL, "Missing INFURA_URL in .env")
 for p in ["Player1", "Player2", "Player3", "Player4"]:
     _require(PK.get(p), f"Missing PRIVATE_KEY_{p[-1]} in .env (e.g. PRIVATE_KEY_1)")
 
+# Read-through RPC cache
+RPC_CACHE_SIZE = 2048           # LRU bound on cached responses
+RPC_CACHE_CONFIRMATIONS = 3     # blocks/receipts/txs this deep are treated as final
+RPC_CACHE_TTL_S = {             # short-lived values
+    "eth_gasPrice": 5.0,
+    "eth_blockNumber": 1.0,
+}
+
+class CachingHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTPProvider that answers repeat lookups from memory. Chain id is cached for
+    good, as are blocks, receipts and txs once they are RPC_CACHE_CONFIRMATIONS
+    deep; gas price and block number are cached for a short TTL.
+    """
+    PERMANENT = {"eth_chainId", "net_version"}
+    FINAL_AFTER_CONFIRMATIONS = {
+        "eth_getBlockByNumber", "eth_getBlockByHash",
+        "eth_getTransactionReceipt", "eth_getTransactionByHash",
+    }
+
+    def __init__(self, *args, cache_size=RPC_CACHE_SIZE, confirmations=RPC_CACHE_CONFIRMATIONS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_size = cache_size
+        self.confirmations = confirmations
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._cache = OrderedDict()  # key -> (expires_at or None, response)
+        self._cache_lock = threading.Lock()
+
+    def make_request(self, method, params):
+        key = self._cache_key(method, params)
+        if key is None:
+            return super().make_request(method, params)
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return entry[1]
+            self.cache_stats["misses"] += 1
+
+        response = super().make_request(method, params)
+        if "error" not in response and response.get("result") is not None:
+            expires_at = self._expiry(method, response["result"])
+            if expires_at is not False:
+                self._store(key, expires_at, response)
+        return response
+
+    def _store(self, key, expires_at, response):
+        with self._cache_lock:
+            self._cache[key] = (expires_at, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_key(self, method, params):
+        if method in self.PERMANENT or method in RPC_CACHE_TTL_S:
+            return method
+        if method in self.FINAL_AFTER_CONFIRMATIONS:
+            # Block tags ("latest", "pending", ...) move, only fixed numbers/hashes are cacheable
+            if method == "eth_getBlockByNumber" and not str(params[0]).startswith("0x"):
+                return None
+            return method + json.dumps(params, default=str)
+        return None
+
+    def _expiry(self, method, result):
+        """None = keep until evicted, a monotonic deadline for TTL entries, False = don't cache."""
+        if method in self.PERMANENT:
+            return None
+        if method in RPC_CACHE_TTL_S:
+            return time.monotonic() + RPC_CACHE_TTL_S[method]
+        # Blocks carry "number", receipts and txs carry "blockNumber" (None while pending)
+        block = result.get("number") if method.startswith("eth_getBlock") else result.get("blockNumber")
+        if block is None:
+            return False
+        return None if int(block, 16) <= self._head_block() - self.confirmations else False
+
+    def _head_block(self):
+        """Chain head for _expiry; an internal lookup, so it stays out of cache_stats."""
+        with self._cache_lock:
+            entry = self._cache.get("eth_blockNumber")
+        if entry is not None and entry[0] > time.monotonic():
+            return int(entry[1]["result"], 16)
+        response = super().make_request("eth_blockNumber", [])
+        if "error" not in response and response.get("result") is not None:
+            self._store("eth_blockNumber", self._expiry("eth_blockNumber", response["result"]), response)
+        return int(response["result"], 16)
+
+    def cache_info(self):
+        with self._cache_lock:
+            return dict(self.cache_stats, size=len(self._cache), max_size=self.cache_size)
+
 # Connect to Sepolia via Infura
-w3 = Web3(Web3.HTTPProvider(INFURA_URL))
+w3 = Web3(CachingHTTPProvider(INFURA_URL))
 _require(w3.is_connected(), "Web3 not connected — check INFURA_URL")
 
 # Build account/address maps
@@ -43,10 +139,11 @@ RESOURCE_VALUE_ETH = {
 }
 
 
-def trigger_transaction(sender_player: str, opponent_player: str, resource: str) -> str:
+def trigger_transaction(sender_player: str, opponent_player: str, resource: str, units: int = 1) -> str:
     """
     Send a P2P EIP‑1559 transaction from `sender_player` to `opponent_player`.
-    Encodes a short message about the trade in the data field.
+    Encodes a short message about the trade in the data field. `units` settles
+    several cards of the same resource in one tx (see trade_planner.py).
     Returns the tx hash hex string.
     """
     if sender_player not in ACCT or opponent_player not in ADDR:
@@ -62,10 +159,11 @@ def trigger_transaction(sender_player: str, opponent_player: str, resource: str)
 
     # Value by resource
     value_eth = RESOURCE_VALUE_ETH.get(resource.upper(), "0")
-    value_wei = Web3.to_wei(value_eth, "ether")
+    value_wei = Web3.to_wei(value_eth, "ether") * units
 
     # Payload text → bytes
-    message = f"{sender_player}→{opponent_player} traded {resource}"
+    traded = resource if units == 1 else f"{units}x {resource}"
+    message = f"{sender_player}→{opponent_player} traded {traded}"
     data_hex = Web3.to_hex(text=message)
 
     # Nonce + gas estimate
@@ -74,7 +172,7 @@ def trigger_transaction(sender_player: str, opponent_player: str, resource: str)
     gas_limit = w3.eth.estimate_gas(tx_for_gas)
 
     tx = {
-        "chainId": 11155111,  # Sepolia
+        "chainId": w3.eth.chain_id,  # cached after the first lookup
         "nonce": nonce,
         "to": recipient,
         "value": value_wei,
@@ -92,7 +190,13 @@ def trigger_transaction(sender_player: str, opponent_player: str, resource: str)
     tx_hash = w3.eth.send_raw_transaction(raw)
     return w3.to_hex(tx_hash)
 
+def rpc_cache_stats():
+    """Hit/miss counters and size of the RPC cache."""
+    return w3.provider.cache_info()
+
 # Optional helper to print addresses once:
 if __name__ == "__main__":
+    print(f"Chain id: {w3.eth.chain_id}")
     for p in ["Player1","Player2","Player3","Player4"]:
-        print(f"{p}: {ADDR[p]}")
\ No newline at end of file
+        print(f"{p}: {ADDR[p]}")
+    print(f"RPC cache: {rpc_cache_stats()}")
\ No newline at end of file
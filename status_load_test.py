@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Load test for status_server.py
+Starts a local status feed, connects hundreds of websocket clients, publishes
+snapshots from a separate thread (like the scan threads do) and reports how
+long each update takes to reach the clients.
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import aiohttp
+
+from status_server import StatusFeed, start_status_server
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def client(session, url, latencies, counts, ready):
+    async with session.ws_connect(url) as ws:
+        ready.release()
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            data = msg.json()
+            if data.get("done"):
+                break
+            if "published_at" in data:
+                latencies.append(time.perf_counter() - data["published_at"])
+                counts.append(data["seq"])
+
+def publisher(feed, updates, interval_s):
+    for seq in range(1, updates + 1):
+        feed.publish({"seq": seq, "published_at": time.perf_counter(),
+                      "pending": {f"Player{i}": {"resource": "FIRE", "uid": None} for i in range(1, 5)}})
+        time.sleep(interval_s)
+    time.sleep(0.5)
+    feed.publish({"done": True})
+
+async def run(clients, updates, interval_s):
+    feed = StatusFeed()
+    port = start_status_server(feed, host="127.0.0.1", port=0)
+    url = f"http://127.0.0.1:{port}/ws"
+
+    latencies, counts = [], []
+    ready = asyncio.Semaphore(0)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        t0 = time.perf_counter()
+        tasks = [asyncio.ensure_future(client(session, url, latencies, counts, ready)) for _ in range(clients)]
+        for _ in range(clients):
+            await ready.acquire()
+        connect_s = time.perf_counter() - t0
+        print(f"🔌 {clients} clients connected in {connect_s:.2f}s")
+
+        pub = threading.Thread(target=publisher, args=(feed, updates, interval_s))
+        t0 = time.perf_counter()
+        pub.start()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - t0
+        pub.join()
+
+    delivered = len(latencies)
+    print(f"📨 {delivered} messages delivered ({delivered / (clients * updates):.0%} of "
+          f"{clients} clients x {updates} updates) in {elapsed:.2f}s")
+    print(f"   {clients * updates - delivered} intermediate updates coalesced for slower clients")
+    if latencies:
+        ms = [l * 1000 for l in latencies]
+        print(f"⏱️  publish→client latency: p50 {statistics.median(ms):.1f} ms, "
+              f"p95 {percentile(ms, 95):.1f} ms, max {max(ms):.1f} ms")
+    missing_final = clients - counts.count(updates)
+    print(f"{'✅' if missing_final == 0 else '❌'} clients that saw the final update: {clients - missing_final}/{clients}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Websocket fan-out load test for the status feed")
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between publishes")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.updates, args.interval))
+
+if __name__ == "__main__":
+    main()
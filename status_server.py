@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Read-only live status API for WTB project
+Serves the latest game snapshot over HTTP (/status) and a websocket feed (/ws)
+for spectator screens. Runs its own asyncio loop in a background thread so the
+scan threads never block on clients.
+"""
+
+import asyncio
+import json
+import threading
+
+from aiohttp import web, WSMsgType
+
+STATUS_HOST = "0.0.0.0"
+STATUS_PORT = 8080
+
+INDEX_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>WTB live</title>
+<style>body{font:28px monospace;background:#111;color:#eee;margin:2em}</style>
+</head><body><h1>WTB live</h1><pre id="s">connecting…</pre>
+<script>
+const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.onmessage = e => { document.getElementById("s").textContent = JSON.stringify(JSON.parse(e.data), null, 2); };
+ws.onclose = () => setTimeout(() => location.reload(), 2000);
+</script></body></html>
+"""
+
+
+class StatusFeed:
+    """
+    Latest-snapshot fan-out. Game threads call publish() with a freshly built
+    dict that is never mutated afterwards, so readers need no lock. Each version
+    is serialised once on the server loop and shared by every client; slow
+    clients skip straight to the newest version.
+    """
+
+    def __init__(self):
+        self._current = (0, {})       # (version, snapshot) swapped atomically
+        self._publish_lock = threading.Lock()  # orders publishers; readers never take it
+        self._encoded = (0, "{}")
+        self._loop = None
+        self._changed = None
+
+    def publish(self, snapshot):
+        """Thread-safe. `snapshot` must be a new object the caller won't touch again."""
+        with self._publish_lock:
+            self._current = (self._current[0] + 1, snapshot)
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wake)
+
+    def snapshot(self):
+        return self._current[1]
+
+    def attach(self, loop):
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def _wake(self):
+        # Swap in a fresh event so every waiter on the old one wakes exactly once
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _payload(self):
+        version, snapshot = self._current
+        if self._encoded[0] != version:
+            self._encoded = (version, json.dumps(snapshot))
+        return self._encoded
+
+    async def wait_newer(self, seen_version):
+        """Return (version, json) once there is a version newer than `seen_version`."""
+        while self._current[0] <= seen_version:
+            await self._changed.wait()
+        return self._payload()
+
+
+def make_app(feed):
+    async def index(request):
+        return web.Response(text=INDEX_HTML, content_type="text/html")
+
+    async def status(request):
+        return web.Response(text=feed._payload()[1], content_type="application/json")
+
+    async def websocket(request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+
+        async def pump():
+            version = -1
+            try:
+                while not ws.closed:
+                    version, payload = await feed.wait_newer(version)
+                    await ws.send_str(payload)
+            except ConnectionResetError:
+                pass
+
+        sender = asyncio.ensure_future(pump())
+        try:
+            # Read-only feed: drain client frames until it goes away
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            sender.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", index)
+    app.router.add_get("/status", status)
+    app.router.add_get("/ws", websocket)
+    return app
+
+
+def start_status_server(feed, host=STATUS_HOST, port=STATUS_PORT):
+    """Serve `feed` from a daemon thread. Returns the bound port (useful with port=0)."""
+    started = threading.Event()
+    bound = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            runner = web.AppRunner(make_app(feed), access_log=None)
+            loop.run_until_complete(runner.setup())
+            site = web.TCPSite(runner, host, port)
+            loop.run_until_complete(site.start())
+            bound["port"] = runner.addresses[0][1]
+            feed.attach(loop)
+        except Exception as e:
+            bound["error"] = e
+            return
+        finally:
+            started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    if "error" in bound:
+        raise RuntimeError(f"Status server failed to start on port {port}: {bound['error']}")
+    return bound["port"]
+
+
+if __name__ == "__main__":
+    import time
+
+    feed = StatusFeed()
+    port = start_status_server(feed)
+    print(f"📺 Demo status feed on http://localhost:{port}/")
+    n = 0
+    while True:
+        n += 1
+        feed.publish({"demo": n, "time": time.time()})
+        time.sleep(1)
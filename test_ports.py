@@ -1,99 +1,159 @@
 #!/usr/bin/env python3
-import serial
+"""
+Serial port diagnostics for WTB project
+Finds every serial device, probes them all at once, and writes the ports that
+answer like nfc_lcd_input.ino to a reader config that game_mode.py loads.
+"""
+import argparse
+import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import serial
+from serial.tools import list_ports
+
+# Firmware runs at 115200, so try that first
+BAUD_RATES = [115200, 9600, 57600, 38400]
+
+READ_WINDOW_S = 3          # max time to listen per baud candidate
+READER_CONFIG = "readers.json"
+
+# Lines that prove we are talking to nfc_lcd_input at the right baud
+FIRMWARE_MARKERS = ("Hello Farcaster", "SCAN,")
 
-PORTS = {
-    "ModuleA": "/dev/tty.usbmodem101",
-    "ModuleB": "/dev/tty.usbmodem1101"
-}
+print_lock = threading.Lock()
 
-BAUD_RATES = [9600, 115200, 57600, 38400]
+def log(msg):
+    with print_lock:
+        print(msg)
+
+def find_serial_ports():
+    """All USB serial devices, falling back to every port if none report a USB id."""
+    ports = list_ports.comports()
+    usb = [p.device for p in ports if p.vid is not None]
+    return sorted(usb or [p.device for p in ports])
+
+def probe_baud(port, baud):
+    """Listen on `port` at `baud` until a firmware line appears or the window closes."""
+    received = []
+    try:
+        ser = serial.Serial(port, baud, timeout=0.05)
+    except Exception as e:
+        log(f"❌ {port} @ {baud}: could not open ({e})")
+        return False, received
 
-def test_port_baud(name, port, baud):
-    print(f"\n--- Testing {name} on {port} at {baud} baud ---")
     try:
-        # Try to open the port
-        ser = serial.Serial(port, baud, timeout=0.1)
-        print(f"✅ Successfully opened {port} at {baud} baud")
-        
         # Set DTR/RTS like the game code does
         try:
             ser.setDTR(False)
             ser.setRTS(False)
         except Exception:
             pass
-        
-        # Wait for Arduino to reset and stabilize
-        time.sleep(2)
-        
-        # Clear any existing data
         ser.reset_input_buffer()
-        
-        # Try to read for a few seconds
-        start_time = time.time()
-        received_data = []
-        
-        while time.time() - start_time < 3:
-            if ser.in_waiting:
-                try:
-                    line = ser.readline().decode(errors="ignore").strip()
-                    if line:
-                        print(f"📥 Received: {line}")
-                        received_data.append(line)
-                except Exception as e:
-                    print(f"❌ Read error: {e}")
-            time.sleep(0.1)
-        
+
+        # Buffer partial reads so a line split across the short timeout isn't lost
+        buf = b""
+        deadline = time.monotonic() + READ_WINDOW_S
+        while time.monotonic() < deadline:
+            buf += ser.read(ser.in_waiting or 1)
+            while b"\n" in buf:
+                raw, buf = buf.split(b"\n", 1)
+                line = raw.decode(errors="ignore").strip()
+                if not line:
+                    continue
+                received.append(line)
+                if line.startswith(FIRMWARE_MARKERS):
+                    log(f"📥 {port} @ {baud}: {line}")
+                    return True, received
+        if buf.strip():
+            received.append(buf.decode(errors="ignore").strip())
+    finally:
         ser.close()
-        
-        if received_data:
-            print(f"✅ {name} received {len(received_data)} messages at {baud} baud")
-            return True, received_data
-        else:
-            print(f"⚠️ {name} received no messages at {baud} baud")
-            return False, []
-        
-    except Exception as e:
-        print(f"❌ Failed to open {port} at {baud} baud: {e}")
-        return False, []
 
-def test_port(name, port):
-    print(f"\n--- Testing {name} on {port} ---")
-    
-    # Test different baud rates
+    return False, received
+
+def probe_port(port):
+    start = time.monotonic()
     for baud in BAUD_RATES:
-        success, data = test_port_baud(name, port, baud)
-        if success:
-            print(f"🎯 Found working baud rate: {baud}")
-            return True, baud, data
-    
-    print(f"❌ No working baud rate found for {name}")
-    return False, None, []
+        found, received = probe_baud(port, baud)
+        if found:
+            elapsed = time.monotonic() - start
+            log(f"🎯 {port}: firmware found at {baud} baud ({elapsed:.1f}s)")
+            return {"port": port, "baud": baud, "messages": received}
+        if not received:
+            # Silence is the same at every baud rate; no point trying the rest
+            break
+        log(f"⚠️ {port} @ {baud}: {len(received)} unrecognised line(s)")
+    log(f"❌ {port}: no firmware response")
+    return {"port": port, "baud": None, "messages": []}
+
+def existing_reader_count(path):
+    try:
+        with open(path) as f:
+            return len(json.load(f).get("readers", []))
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def write_reader_config(readers, path):
+    with open(path, "w") as f:
+        json.dump({"readers": readers}, f, indent=2)
+        f.write("\n")
 
 def main():
-    print("🔌 Testing Serial Port Connections with Multiple Baud Rates")
+    parser = argparse.ArgumentParser(description="Probe serial ports for WTB NFC readers")
+    parser.add_argument("ports", nargs="*", help="ports to probe (default: auto-discover)")
+    parser.add_argument("--output", default=READER_CONFIG, help="reader config to write")
+    parser.add_argument("--force", action="store_true",
+                        help="overwrite the config even if fewer readers were found than it lists")
+    args = parser.parse_args()
+
+    print("🔌 Probing serial ports for NFC readers")
     print("=" * 60)
-    
-    results = {}
-    for name, port in PORTS.items():
-        success, working_baud, data = test_port(name, port)
-        results[name] = (success, working_baud, data)
-    
+
+    ports = args.ports or find_serial_ports()
+    if not ports:
+        print("❌ No serial devices found. Is the Arduino plugged in?")
+        return
+
+    print(f"🔍 {len(ports)} port(s): {', '.join(ports)}")
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        results = list(pool.map(probe_port, ports))
+    elapsed = time.monotonic() - start
+
     print("\n" + "=" * 60)
-    print("📊 Test Results:")
-    for name, (success, baud, data) in results.items():
-        if success:
-            print(f"  {name}: ✅ PASS at {baud} baud")
-            if data:
-                print(f"    Messages: {data}")
+    print(f"📊 Test Results ({elapsed:.1f}s):")
+    for r in results:
+        if r["baud"]:
+            print(f"  {r['port']}: ✅ PASS at {r['baud']} baud")
         else:
-            print(f"  {name}: ❌ FAIL - no working baud rate")
-    
-    print("\n💡 If no data is received, the Arduino might:")
-    print("   - Not be sending serial messages")
-    print("   - Have a different baud rate than expected")
-    print("   - Be stuck in an error state")
-    print("   - Need to be reprogrammed")
+            print(f"  {r['port']}: ❌ FAIL - no firmware response")
+
+    # Assign found ports to readers 1, 2, ... in device-name order
+    readers = [
+        {"reader": i, "port": r["port"], "baud": r["baud"]}
+        for i, r in enumerate((r for r in results if r["baud"]), start=1)
+    ]
+    previous = existing_reader_count(args.output)
+    if not readers:
+        print(f"\n⚠️ No readers found; leaving {args.output} unchanged.")
+    elif len(readers) < previous and not args.force:
+        print(f"\n⚠️ Found {len(readers)} reader(s) but {args.output} lists {previous}; "
+              f"leaving it unchanged (use --force to overwrite).")
+    else:
+        write_reader_config(readers, args.output)
+        print(f"\n💾 Wrote {args.output}:")
+        for r in readers:
+            print(f"   Reader {r['reader']}: {r['port']} @ {r['baud']}")
+        print("   Swap the reader numbers if Player1/2 and Player3/4 are reversed.")
+
+    if len(readers) < len(results):
+        print("\n💡 If no data is received, the Arduino might:")
+        print("   - Not have reset on open (tap a card during the probe)")
+        print("   - Have a different baud rate than expected")
+        print("   - Be stuck in an error state")
+        print("   - Need to be reprogrammed")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+On-chain trade history indexer for WTB project
+Backfills blocks for transactions between the four player wallets, then follows
+new blocks. Trades are decoded from the UTF-8 message in the tx data field and
+stored in a local SQLite database, so history queries never touch the RPC.
+
+Usage:
+    python trade_indexer.py                                  # resume from checkpoint, then follow
+    python trade_indexer.py --from-block 8000000 --to-block 8005000
+    python trade_indexer.py --query --player Player3 --resource FIRE
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from web3.exceptions import Web3TypeError
+except ImportError:  # web3 < 7
+    Web3TypeError = TypeError
+
+DB_PATH = "trades.db"
+
+BATCH_SIZE = 50              # blocks per batched fetch
+CONFIRMATIONS = 3            # only index blocks this far behind head (reorg safety)
+DEFAULT_BACKFILL_BLOCKS = 10000   # used when there is no checkpoint and no --from-block
+POLL_INTERVAL_S = 12         # ~1 Sepolia block
+
+# Message written by onchain.trigger_transaction, e.g. "Player1→Player2 traded FIRE"
+# or "Player1→Player2 traded 2x FIRE" for a netted multi-card transfer
+TRADE_MESSAGE = re.compile(r"^(Player\d)→(Player\d) traded (?:(\d+)x )?([A-Z]+)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    tx_hash          TEXT PRIMARY KEY,
+    block_number     INTEGER NOT NULL,
+    tx_index         INTEGER NOT NULL,
+    timestamp        INTEGER NOT NULL,
+    sender_player    TEXT NOT NULL,
+    recipient_player TEXT NOT NULL,
+    resource         TEXT,
+    units            INTEGER NOT NULL DEFAULT 1,
+    value_wei        TEXT NOT NULL,
+    status           INTEGER,
+    message          TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_trades_sender ON trades (sender_player, resource, block_number);
+CREATE INDEX IF NOT EXISTS idx_trades_recipient ON trades (recipient_player, resource, block_number);
+CREATE INDEX IF NOT EXISTS idx_trades_resource ON trades (resource, block_number);
+CREATE INDEX IF NOT EXISTS idx_trades_block ON trades (block_number);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    name         TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+# --- Database ---
+
+def open_db(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def get_checkpoint(conn):
+    row = conn.execute("SELECT block_number FROM checkpoint WHERE name = 'trades'").fetchone()
+    return row["block_number"] if row else None
+
+def query_trades(conn, player=None, resource=None, role="any", from_block=None, to_block=None):
+    """
+    Return indexed trades, newest first. `role` selects whether `player` must be
+    the sender ("sent"), the recipient ("received") or either ("any").
+    """
+    where, args = [], []
+    if player:
+        if role == "sent":
+            where.append("sender_player = ?")
+            args.append(player)
+        elif role == "received":
+            where.append("recipient_player = ?")
+            args.append(player)
+        else:
+            where.append("(sender_player = ? OR recipient_player = ?)")
+            args += [player, player]
+    if resource:
+        where.append("resource = ?")
+        args.append(resource.upper())
+    if from_block is not None:
+        where.append("block_number >= ?")
+        args.append(from_block)
+    if to_block is not None:
+        where.append("block_number <= ?")
+        args.append(to_block)
+
+    sql = "SELECT * FROM trades"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY block_number DESC, tx_index DESC"
+    return conn.execute(sql, args).fetchall()
+
+
+# --- Decoding ---
+
+def decode_trade_message(data):
+    """Decode the tx data field into (message, resource, units). Non-trade payloads give (text, None, 1)."""
+    try:
+        message = bytes(data).decode("utf-8").strip()
+    except (UnicodeDecodeError, TypeError):
+        return None, None, 1
+    match = TRADE_MESSAGE.match(message)
+    if not match:
+        return message or None, None, 1
+    return message, match.group(4), int(match.group(3) or 1)
+
+
+# --- Fetching ---
+
+def _fetch_all(w3, request, items):
+    """
+    Run `request(item)` for every item: as one JSON-RPC batch where the provider
+    supports it, otherwise as concurrent single requests.
+    """
+    items = list(items)
+    if not items:
+        return []
+    try:
+        batch_cm = w3.batch_requests()
+    except (AttributeError, Web3TypeError):
+        # web3 < 7 has no batch API; providers without batch support raise
+        batch_cm = None
+    if batch_cm is not None:
+        with batch_cm as batch:
+            for item in items:
+                batch.add(request(item))
+            return batch.execute()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return list(pool.map(request, items))
+
+def fetch_blocks(w3, numbers):
+    return _fetch_all(w3, lambda n: w3.eth.get_block(n, full_transactions=True), numbers)
+
+def fetch_receipts(w3, tx_hashes):
+    return _fetch_all(w3, w3.eth.get_transaction_receipt, tx_hashes)
+
+
+# --- Indexing ---
+
+def index_range(conn, w3, addr_to_player, start, end, batch_size=BATCH_SIZE):
+    """Index blocks [start, end] in batches, advancing the checkpoint after each batch."""
+    indexed = 0
+    for batch_start in range(start, end + 1, batch_size):
+        batch_end = min(batch_start + batch_size - 1, end)
+        blocks = fetch_blocks(w3, range(batch_start, batch_end + 1))
+
+        matches = []
+        for block in blocks:
+            for tx_index, tx in enumerate(block["transactions"]):
+                sender = addr_to_player.get((tx["from"] or "").lower())
+                recipient = addr_to_player.get((tx["to"] or "").lower())
+                if sender and recipient:
+                    matches.append((block, tx_index, tx, sender, recipient))
+
+        receipts = fetch_receipts(w3, [tx["hash"] for _, _, tx, _, _ in matches])
+
+        rows = []
+        for (block, tx_index, tx, sender, recipient), receipt in zip(matches, receipts):
+            message, resource, units = decode_trade_message(tx.get("input", tx.get("data")))
+            rows.append({
+                "tx_hash": w3.to_hex(tx["hash"]),
+                "block_number": block["number"],
+                "tx_index": tx_index,
+                "timestamp": block["timestamp"],
+                "sender_player": sender,
+                "recipient_player": recipient,
+                "resource": resource,
+                "units": units,
+                "value_wei": str(tx["value"]),
+                "status": receipt["status"],
+                "message": message,
+            })
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO trades (tx_hash, block_number, tx_index, timestamp, "
+                "sender_player, recipient_player, resource, units, value_wei, status, message) "
+                "VALUES (:tx_hash, :block_number, :tx_index, :timestamp, :sender_player, "
+                ":recipient_player, :resource, :units, :value_wei, :status, :message)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO checkpoint (name, block_number) VALUES ('trades', ?) "
+                "ON CONFLICT (name) DO UPDATE SET block_number = MAX(block_number, excluded.block_number)",
+                (batch_end,),
+            )
+        indexed += len(rows)
+        print(f"📚 Blocks {batch_start}-{batch_end}: {len(rows)} trades")
+    return indexed
+
+def run_indexer(conn, from_block=None, to_block=None, follow=True, batch_size=BATCH_SIZE):
+    # Imported here so --query works offline without RPC credentials
+    from onchain import w3, ADDR
+
+    addr_to_player = {a.lower(): p for p, a in ADDR.items()}
+
+    checkpoint = get_checkpoint(conn)
+    head = w3.eth.block_number - CONFIRMATIONS
+    if from_block is not None:
+        start = from_block
+    elif checkpoint is not None:
+        start = checkpoint + 1
+    else:
+        start = max(0, head - DEFAULT_BACKFILL_BLOCKS)
+
+    end = head if to_block is None else min(to_block, head)
+    if start <= end:
+        print(f"🔎 Backfilling blocks {start}-{end}")
+        total = index_range(conn, w3, addr_to_player, start, end, batch_size)
+        print(f"✅ Backfill done: {total} trades indexed")
+    next_block = max(start, end + 1)
+
+    if not follow or to_block is not None:
+        return
+
+    print("👀 Following new blocks (Ctrl+C to stop)...")
+    while True:
+        head = w3.eth.block_number - CONFIRMATIONS
+        if head >= next_block:
+            index_range(conn, w3, addr_to_player, next_block, head, batch_size)
+            next_block = head + 1
+        time.sleep(POLL_INTERVAL_S)
+
+
+def print_trades(rows):
+    for r in rows:
+        ok = "✅" if r["status"] == 1 else "❌"
+        units = f"{r['units']}x " if r["units"] != 1 else ""
+        print(f"  {ok} #{r['block_number']} {r['sender_player']}→{r['recipient_player']} "
+              f"{units}{r['resource'] or '?'}  {r['tx_hash']}")
+    print(f"\n{len(rows)} trade(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Index WTB player trades into a local database")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    parser.add_argument("--from-block", type=int, help="first block to index (default: checkpoint)")
+    parser.add_argument("--to-block", type=int, help="last block to index (default: follow head)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="blocks per batched fetch")
+    parser.add_argument("--no-follow", action="store_true", help="exit after backfill")
+    parser.add_argument("--query", action="store_true", help="query the local database instead of indexing")
+    parser.add_argument("--player", help="e.g. Player3")
+    parser.add_argument("--resource", help="e.g. FIRE")
+    parser.add_argument("--role", choices=["any", "sent", "received"], default="sent",
+                        help="which side of the trade --player is on")
+    args = parser.parse_args()
+
+    conn = open_db(args.db)
+
+    if args.query:
+        t0 = time.perf_counter()
+        rows = query_trades(conn, args.player, args.resource, args.role, args.from_block, args.to_block)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        print_trades(rows)
+        print(f"⏱️  {elapsed_ms:.2f} ms")
+        return
+
+    try:
+        run_indexer(conn, args.from_block, args.to_block, not args.no_follow, args.batch_size)
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped at checkpoint {get_checkpoint(conn)}")
+
+if __name__ == "__main__":
+    main()
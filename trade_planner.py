@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Round-level trade planner for WTB project
+Turns what each player offers and wants into the transfers that settle the
+round. Transfers that cancel out (A→B and B→A of the same resource, or a
+resource going round a cycle) are netted away, and positions are split into
+the most zero-sum groups, so fewer transactions hit the chain.
+"""
+
+from collections import Counter, namedtuple
+
+Transfer = namedtuple("Transfer", "sender recipient resource units")
+
+# Above this many open positions per resource the exact group search
+# (2^n subsets) is skipped and the greedy matcher settles them directly
+EXACT_MAX_POSITIONS = 12
+
+
+def _as_counter(items):
+    """Accept a resource name, a list of names or a {resource: count} mapping."""
+    if items is None:
+        return Counter()
+    if isinstance(items, str):
+        return Counter({items.upper(): 1})
+    if isinstance(items, dict):
+        return Counter({r.upper(): n for r, n in items.items() if n})
+    return Counter(r.upper() for r in items)
+
+
+def plan_settlement(offered, wanted):
+    """
+    Settle a round given `offered` and `wanted` ({player: resources}).
+    Each player's position per resource is netted first; players with a
+    surplus then pay players with a deficit. Supply nobody wants stays put
+    and demand nobody can meet goes unfilled. Returns a list of Transfers.
+
+    A group of k positions that sums to zero settles in k - 1 transfers, so
+    the fewest transfers come from the most zero-sum groups. That is exact
+    up to EXACT_MAX_POSITIONS positions when supply equals demand; larger or
+    unbalanced resources may take a few more transfers than the minimum.
+    """
+    players = list(dict.fromkeys(list(offered) + list(wanted)))
+    offers = {p: _as_counter(offered.get(p)) for p in players}
+    wants = {p: _as_counter(wanted.get(p)) for p in players}
+    resources = sorted(set().union(*offers.values(), *wants.values())) if players else []
+
+    transfers = []
+    for resource in resources:
+        net = {p: offers[p][resource] - wants[p][resource] for p in players}
+        positions = [(p, n) for p, n in net.items() if n]
+        excess = sum(n for _, n in positions)
+        if excess:
+            # Leftover supply/demand becomes one more position; transfers to
+            # or from it are never sent
+            positions.append((None, -excess))
+        for group in _zero_sum_groups(positions):
+            givers = [[p, n] for p, n in group if n > 0]
+            takers = [[p, -n] for p, n in group if n < 0]
+            transfers += [t for t in _match(givers, takers, resource)
+                          if t.sender is not None and t.recipient is not None]
+    return transfers
+
+
+def _zero_sum_groups(positions):
+    """Split positions (summing to zero) into as many zero-sum groups as possible."""
+    n = len(positions)
+    if n > EXACT_MAX_POSITIONS:
+        return [positions]
+    full = (1 << n) - 1
+    total = [0] * (full + 1)
+    best = [0] * (full + 1)   # most zero-sum groups a subset splits into
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        total[mask] = total[mask ^ low] + positions[low.bit_length() - 1][1]
+        best[mask] = max(best[mask ^ (1 << i)] for i in range(n) if mask >> i & 1) + (total[mask] == 0)
+
+    # Walk back from the full set; every zero-sum subset on the way closes a group
+    groups, mask, group_end = [], full, full
+    while mask:
+        target = best[mask] - (total[mask] == 0)
+        i = next(i for i in range(n) if mask >> i & 1 and best[mask ^ (1 << i)] == target)
+        mask ^= 1 << i
+        if total[mask] == 0:
+            groups.append([positions[j] for j in range(n) if (group_end ^ mask) >> j & 1])
+            group_end = mask
+    return groups
+
+
+def _match(givers, takers, resource):
+    # Exact matches first: each one settles two positions with one transfer
+    transfers = []
+    for g in givers:
+        for t in takers:
+            if g[1] and g[1] == t[1]:
+                transfers.append(Transfer(g[0], t[0], resource, g[1]))
+                g[1] = t[1] = 0
+                break
+
+    # Then largest surplus pays largest deficit until one side runs out
+    givers = sorted((g for g in givers if g[1]), key=lambda g: -g[1])
+    takers = sorted((t for t in takers if t[1]), key=lambda t: -t[1])
+    gi = ti = 0
+    while gi < len(givers) and ti < len(takers):
+        g, t = givers[gi], takers[ti]
+        units = min(g[1], t[1])
+        transfers.append(Transfer(g[0], t[0], resource, units))
+        g[1] -= units
+        t[1] -= units
+        if not g[1]:
+            gi += 1
+        if not t[1]:
+            ti += 1
+    return transfers
+
+
+def ring_trades(offers):
+    """The classic rotation: each player sends its resource to the next one (P1→P2→…→P1)."""
+    players = list(offers)
+    return [
+        Transfer(p, players[(i + 1) % len(players)], offers[p].upper(), 1)
+        for i, p in enumerate(players)
+    ]
+
+
+def plan_round(offers, wanted=None):
+    """
+    Plan a game round from `offers` ({player: resource}, in rotation order).
+    Players without an explicit want take whatever the previous player in the
+    rotation offers, which reproduces the ring trade before netting.
+    """
+    wanted = dict(wanted or {})
+    for t in ring_trades(offers):
+        wanted.setdefault(t.recipient, t.resource)
+    order = {p: i for i, p in enumerate(offers)}
+    return sorted(plan_settlement(offers, wanted), key=lambda t: order.get(t.sender, len(order)))